@@ -1,6 +1,5 @@
 use eyre::ContextCompat;
 use iset::IntervalSet;
-use itertools::Itertools;
 use noodles::{
     bed::{
         self,
@@ -9,9 +8,9 @@ use noodles::{
     core::Position,
     fasta::{record::Definition, Writer},
 };
-use std::{fs::File, io::Write};
+use std::io::Write;
 
-use crate::utils::{generate_random_seq_ranges, write_misassembly};
+use crate::utils::{generate_random_seq_ranges, seq_until_next_segment, write_misassembly};
 
 #[derive(Debug, PartialEq, Eq)]
 pub struct SequenceBreak(pub usize);
@@ -35,11 +34,10 @@ pub fn generate_breaks<'a>(
     // Number of seqs is equal to number of breaks + 1.
     // Start (-|-|-) Stop
     let mut seqs = Vec::with_capacity(number + 1);
-    let mut breaks: Vec<Option<SequenceBreak>> = vec![];
-    let seq_segments = generate_random_seq_ranges(seq.len(), regions, 1, number, seed)?
+    let mut breaks: Vec<Option<SequenceBreak>> = Vec::with_capacity(number + 1);
+    let mut seq_iter = generate_random_seq_ranges(seq.len(), regions, 1, number, seed)?
         .context("No sequence segments")?
-        .collect_vec();
-    let mut seq_iter = seq_segments.into_iter().peekable();
+        .peekable();
 
     // Add starting sequence before first break.
     if let Some((_, _, brange)) = seq_iter.peek() {
@@ -49,11 +47,7 @@ pub fn generate_breaks<'a>(
     };
 
     while let Some((_, _, brange)) = seq_iter.next() {
-        let segment = if let Some((_, _, next_brange)) = seq_iter.peek() {
-            &seq[brange.start..next_brange.start]
-        } else {
-            &seq[brange.start..seq.len()]
-        };
+        let segment = seq_until_next_segment(seq, brange.start, seq_iter.peek().map(|(_, _, r)| r));
         seqs.push(segment);
         breaks.push(Some(SequenceBreak(brange.start)))
     }
@@ -61,14 +55,15 @@ pub fn generate_breaks<'a>(
     Ok((seqs, breaks))
 }
 
-pub fn write_breaks<O, R, I>(
+pub fn write_breaks<O, B, R, I>(
     record_name: &str,
     seq_region_pairs: (Vec<&str>, I),
     writer_fa: &mut Writer<O>,
-    output_bed: &mut Option<bed::Writer<File>>,
+    output_bed: &mut Option<bed::Writer<B>>,
 ) -> eyre::Result<()>
 where
     O: Write,
+    B: Write,
     R: TryInto<Builder<3>>,
     I: IntoIterator<Item = Option<R>>,
 {
@@ -81,7 +76,7 @@ where
         let new_definition = Definition::new(format!("{record_name}_ctg_{i}"), None);
         if let Some(region) = region {
             write_misassembly(
-                seq.bytes().collect_vec(),
+                seq.as_bytes().to_vec(),
                 std::iter::once(region),
                 new_definition,
                 writer_fa,
@@ -89,11 +84,11 @@ where
             )?;
         } else {
             write_misassembly(
-                seq.bytes().collect_vec(),
+                seq.as_bytes().to_vec(),
                 std::iter::empty::<R>(),
                 new_definition,
                 writer_fa,
-                None,
+                None::<&mut bed::Writer<B>>,
             )?;
         }
     }
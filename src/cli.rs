@@ -26,6 +26,10 @@ pub struct Cli {
     /// Seed to use for the random number generator.
     #[arg(short, long, global = true)]
     pub seed: Option<u64>,
+
+    /// Log debug output, including the regions used for each sequence.
+    #[arg(short, long, global = true)]
+    pub verbose: bool,
 }
 
 #[derive(Debug, PartialEq, Eq, Subcommand)]
@@ -1,6 +1,5 @@
 use eyre::ContextCompat;
 use iset::IntervalSet;
-use itertools::Itertools;
 use noodles::{
     bed::{
         self,
@@ -10,7 +9,7 @@ use noodles::{
 };
 use rand::{rngs::StdRng, seq::IteratorRandom, SeedableRng};
 
-use crate::utils::generate_random_seq_ranges;
+use crate::utils::{generate_random_seq_ranges, seq_until_next_segment};
 
 #[derive(Debug, PartialEq, Eq, Clone)]
 pub struct DuplicateSequence {
@@ -44,12 +43,11 @@ pub fn generate_false_duplication(
     max_duplications: usize,
     seed: Option<u64>,
 ) -> eyre::Result<DuplicateSequence> {
-    let seq_segments = generate_random_seq_ranges(seq.len(), regions, length, number, seed)?
+    let mut seq_iter = generate_random_seq_ranges(seq.len(), regions, length, number, seed)?
         .context("No sequence segments")?
-        .collect_vec();
-    let mut seq_iter = seq_segments.into_iter().peekable();
-    let mut new_seq = String::new();
-    let mut duplicated_seqs = vec![];
+        .peekable();
+    let mut new_seq = String::with_capacity(seq.len());
+    let mut duplicated_seqs = Vec::with_capacity(number);
 
     // Add starting sequence before first position.
     if let Some((_, _, rrange)) = seq_iter.peek() {
@@ -73,11 +71,8 @@ pub fn generate_false_duplication(
             new_seq.push_str(dup_seq);
         }
 
-        let remaining_seq = if let Some((_, _, next_rrange)) = seq_iter.peek() {
-            &seq[rrange.end..next_rrange.start]
-        } else {
-            &seq[rrange.end..seq.len()]
-        };
+        let remaining_seq =
+            seq_until_next_segment(seq, rrange.end, seq_iter.peek().map(|(_, _, r)| r));
         new_seq.push_str(remaining_seq);
         duplicated_seqs.push(repeat);
     }
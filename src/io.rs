@@ -2,29 +2,35 @@ use crate::cli::Cli;
 use clap::CommandFactory;
 use iset::IntervalSet;
 use log::info;
-use noodles::{bed, bgzf, core::Position};
+use noodles::{
+    bed, bgzf,
+    core::Position,
+    fasta::{self, record::Definition},
+};
 use std::{
     collections::HashMap,
     ffi::OsStr,
     fs::File,
-    io::{stdin, stdout, BufRead, BufReader, IsTerminal, Write},
+    io::{stdin, stdout, BufRead, BufReader, BufWriter, IsTerminal, Write},
+    num::NonZeroUsize,
     path::PathBuf,
 };
 
-type Outfiles = (Box<dyn Write>, Option<bed::Writer<File>>);
+type Outfiles = (Box<dyn Write>, Option<BufWriter<File>>);
 
 pub fn get_outfile_writers(
     outfile: Option<PathBuf>,
     outbedfile: Option<PathBuf>,
 ) -> eyre::Result<Outfiles> {
+    // Buffer writes as records are written line-by-line.
     let output_fa: Box<dyn Write> = if let Some(outfile) = outfile {
-        Box::new(File::create(outfile)?)
+        Box::new(BufWriter::new(File::create(outfile)?))
     } else {
-        Box::new(stdout().lock())
+        Box::new(BufWriter::new(stdout().lock()))
     };
     let output_bed = outbedfile
         .and_then(|f| File::create(f).ok())
-        .map(bed::Writer::new);
+        .map(BufWriter::new);
 
     Ok((output_fa, output_bed))
 }
@@ -38,13 +44,44 @@ pub fn get_fa_reader(infile: PathBuf) -> eyre::Result<Box<dyn BufRead>> {
         info!("Reading from stdin.");
         Ok(Box::new(BufReader::new(stdin().lock())) as Box<dyn BufRead>)
     } else if infile.extension() == Some(OsStr::new("gz")) {
-        Ok(Box::new(bgzf::Reader::new(File::open(&infile)?)))
+        // Blocks are independent so decompress them across all available cores.
+        let worker_count = std::thread::available_parallelism().unwrap_or(NonZeroUsize::MIN);
+        info!("Reading {infile:?} with {worker_count} worker(s).");
+        Ok(Box::new(bgzf::MultithreadedReader::with_worker_count(
+            worker_count,
+            File::open(&infile)?,
+        )))
     } else {
         info!("Reading {infile:?}.");
         Ok(Box::new(BufReader::new(File::open(&infile)?)))
     }
 }
 
+/// Read the next FASTA record into reusable buffers.
+///
+/// # Arguments
+/// * `reader_fa` - FASTA reader.
+/// * `definition_buf` - Buffer for the definition line. Cleared before reading.
+/// * `sequence_buf` - Buffer for the sequence. Cleared before reading.
+///
+/// # Returns
+/// The parsed definition, or `None` at the end of the input.
+///
+pub fn read_record<R: BufRead>(
+    reader_fa: &mut fasta::Reader<R>,
+    definition_buf: &mut String,
+    sequence_buf: &mut Vec<u8>,
+) -> eyre::Result<Option<Definition>> {
+    definition_buf.clear();
+    if reader_fa.read_definition(definition_buf)? == 0 {
+        return Ok(None);
+    }
+    let definition: Definition = definition_buf.parse()?;
+    sequence_buf.clear();
+    reader_fa.read_sequence(sequence_buf)?;
+    Ok(Some(definition))
+}
+
 pub fn get_regions(
     mut reader_bed: Option<bed::Reader<BufReader<File>>>,
 ) -> Option<HashMap<String, IntervalSet<Position>>> {
@@ -52,17 +89,60 @@ pub fn get_regions(
         let mut regions: HashMap<String, IntervalSet<Position>> = HashMap::new();
         for rec in input_bed.records::<3>().flatten() {
             let region = rec.start_position()..rec.end_position();
-            regions
-                .entry(rec.reference_sequence_name().to_string())
-                .and_modify(|r| {
-                    r.insert(region.clone());
-                })
-                .or_insert_with(|| {
-                    let mut rs = IntervalSet::new();
-                    rs.insert(region);
-                    rs
-                });
+            let name = rec.reference_sequence_name();
+            // Only allocate an owned key on the first region of a sequence.
+            if let Some(rs) = regions.get_mut(name) {
+                rs.insert(region);
+            } else {
+                let mut rs = IntervalSet::new();
+                rs.insert(region);
+                regions.insert(name.to_string(), rs);
+            }
         }
         regions
     })
 }
+
+#[cfg(test)]
+mod test {
+    use noodles::fasta;
+
+    use super::read_record;
+
+    #[test]
+    fn test_read_record() {
+        let data = b">chr1 desc\nACGT\nAC\n>chr2\nGG\n";
+        let mut reader = fasta::Reader::new(&data[..]);
+        let mut definition_buf = String::new();
+        let mut sequence_buf = Vec::new();
+
+        let definition = read_record(&mut reader, &mut definition_buf, &mut sequence_buf)
+            .unwrap()
+            .unwrap();
+        assert_eq!(definition.name(), &b"chr1"[..]);
+        assert_eq!(sequence_buf, b"ACGTAC");
+
+        // Buffers are cleared between records.
+        let definition = read_record(&mut reader, &mut definition_buf, &mut sequence_buf)
+            .unwrap()
+            .unwrap();
+        assert_eq!(definition.name(), &b"chr2"[..]);
+        assert_eq!(sequence_buf, b"GG");
+
+        assert!(
+            read_record(&mut reader, &mut definition_buf, &mut sequence_buf)
+                .unwrap()
+                .is_none()
+        );
+    }
+
+    #[test]
+    fn test_read_record_malformed_definition() {
+        let data = b"chr1\nACGT\n";
+        let mut reader = fasta::Reader::new(&data[..]);
+        let mut definition_buf = String::new();
+        let mut sequence_buf = Vec::new();
+
+        assert!(read_record(&mut reader, &mut definition_buf, &mut sequence_buf).is_err());
+    }
+}
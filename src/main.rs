@@ -1,9 +1,12 @@
-use std::{fs::File, io::BufReader};
+use std::{
+    fs::File,
+    io::{BufReader, Write},
+};
 
 use clap::Parser;
 use eyre::bail;
 use iset::IntervalSet;
-use log::{info, LevelFilter};
+use log::{debug, info, LevelFilter};
 use noodles::{bed, core::Position, fasta};
 use simple_logger::SimpleLogger;
 
@@ -18,7 +21,7 @@ use {
     breaks::{generate_breaks, write_breaks},
     cli::Cli,
     false_dupe::generate_false_duplication,
-    io::{get_fa_reader, get_outfile_writers, get_regions},
+    io::{get_fa_reader, get_outfile_writers, get_regions, read_record},
     misjoin::generate_deletion,
     utils::write_misassembly,
 };
@@ -40,26 +43,37 @@ fn generate_misassemblies(cli: cli::Cli) -> eyre::Result<()> {
         .map(bed::Reader::new);
     let input_regions = get_regions(reader_bed);
 
-    let (output_fa, mut output_bed) = get_outfile_writers(cli.outfile, cli.outbedfile)?;
-    let mut writer_fa = fasta::Writer::new(output_fa);
+    let (mut output_fa, mut output_bed) = get_outfile_writers(cli.outfile, cli.outbedfile)?;
+    let mut writer_fa = fasta::Writer::new(&mut output_fa);
+    let mut writer_bed = output_bed.as_mut().map(bed::Writer::new);
 
     let seed = cli.seed;
 
+    // Reuse record buffers rather than allocating a new record per sequence.
+    let mut definition_buf = String::new();
+    let mut sequence_buf = Vec::new();
+
     // TODO: async for concurrent record reading.
-    for record in reader_fa.records().flatten() {
-        let record_name = std::str::from_utf8(record.definition().name())?;
-        let record_interval =
-            Position::new(1).unwrap()..Position::new(record.sequence().len()).unwrap();
-        let def_record_regions = IntervalSet::from_iter(std::iter::once(record_interval));
-        let record_regions = input_regions
-            .as_ref()
-            .and_then(|r| r.get(record_name))
-            .unwrap_or(&def_record_regions);
+    while let Some(definition) =
+        read_record(&mut reader_fa, &mut definition_buf, &mut sequence_buf)?
+    {
+        let record_name = std::str::from_utf8(definition.name())?;
+        // Default to the whole record only if no regions were given for it.
+        let def_record_regions;
+        let record_regions = match input_regions.as_ref().and_then(|r| r.get(record_name)) {
+            Some(regions) => regions,
+            None => {
+                let record_interval =
+                    Position::new(1).unwrap()..Position::new(sequence_buf.len()).unwrap();
+                def_record_regions = IntervalSet::from_iter(std::iter::once(record_interval));
+                &def_record_regions
+            }
+        };
 
         info!("Processing record: {:?}.", record_name);
-        info!("With regions: {:?}.", record_regions);
+        debug!("With regions: {:?}.", record_regions);
 
-        let seq = std::str::from_utf8(record.sequence().as_ref())?;
+        let seq = std::str::from_utf8(&sequence_buf)?;
 
         match command {
             cli::Commands::Misjoin { number, length } | cli::Commands::Gap { number, length } => {
@@ -69,8 +83,7 @@ fn generate_misassemblies(cli: cli::Cli) -> eyre::Result<()> {
                     length,
                     number,
                     // If gap, mask deletion.
-                    std::mem::discriminant(&command)
-                        == std::mem::discriminant(&cli::Commands::Gap { number, length }),
+                    matches!(command, cli::Commands::Gap { .. }),
                     seed,
                 )?;
                 info!("{} sequences removed.", deleted_seq.removed_seqs.len());
@@ -78,9 +91,9 @@ fn generate_misassemblies(cli: cli::Cli) -> eyre::Result<()> {
                 write_misassembly(
                     deleted_seq.seq.into_bytes(),
                     deleted_seq.removed_seqs,
-                    record.definition().clone(),
+                    definition.clone(),
                     &mut writer_fa,
-                    output_bed.as_mut(),
+                    writer_bed.as_mut(),
                 )?;
             }
             cli::Commands::FalseDuplication {
@@ -104,24 +117,36 @@ fn generate_misassemblies(cli: cli::Cli) -> eyre::Result<()> {
                 write_misassembly(
                     false_dupe_seq.seq.into_bytes(),
                     false_dupe_seq.duplicated_seqs,
-                    record.definition().clone(),
+                    definition.clone(),
                     &mut writer_fa,
-                    output_bed.as_mut(),
+                    writer_bed.as_mut(),
                 )?;
             }
             cli::Commands::Break { number, .. } => {
                 let seq_breaks = generate_breaks(seq, record_regions, number, seed)?;
-                write_breaks(record_name, seq_breaks, &mut writer_fa, &mut output_bed)?;
+                write_breaks(record_name, seq_breaks, &mut writer_fa, &mut writer_bed)?;
             }
         }
     }
 
+    // Flush explicitly as BufWriter ignores errors when flushing on drop.
+    output_fa.flush()?;
+    if let Some(output_bed) = output_bed.as_mut() {
+        output_bed.flush()?;
+    }
+
     Ok(())
 }
 
 fn main() -> eyre::Result<()> {
-    SimpleLogger::new().with_level(LevelFilter::Debug).init()?;
     let cli = Cli::parse();
+    // Only format and write per-record debug output when asked for.
+    let log_level = if cli.verbose {
+        LevelFilter::Debug
+    } else {
+        LevelFilter::Info
+    };
+    SimpleLogger::new().with_level(log_level).init()?;
     // let cli = if std::env::var("DEBUG").map_or(false, |v| v == "1" || v == "true") {
     //     Cli {
     //         command: Commands::Break {
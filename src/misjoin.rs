@@ -1,6 +1,5 @@
 use eyre::ContextCompat;
 use iset::IntervalSet;
-use itertools::Itertools;
 use noodles::{
     bed::{
         record::{Builder, OptionalFields},
@@ -9,7 +8,7 @@ use noodles::{
     core::Position,
 };
 
-use crate::utils::generate_random_seq_ranges;
+use crate::utils::{generate_random_seq_ranges, seq_until_next_segment};
 
 #[derive(Debug, PartialEq, Eq, Clone)]
 pub struct RemovedSequence<'a> {
@@ -45,11 +44,10 @@ pub fn generate_deletion<'a>(
 ) -> eyre::Result<DeletedSequence<'a>> {
     let mut new_seq = String::with_capacity(seq.len());
     let mut removed_seqs: Vec<RemovedSequence> = Vec::with_capacity(number_dels);
-    let seq_segments = generate_random_seq_ranges(seq.len(), regions, length, number_dels, seed)?
+    let mut seq_iter = generate_random_seq_ranges(seq.len(), regions, length, number_dels, seed)?
         .context("No sequence segments")?
-        .collect_vec();
+        .peekable();
 
-    let mut seq_iter = seq_segments.into_iter().peekable();
     // Add starting sequence before first position.
     if let Some((_, _, del_range)) = seq_iter.peek() {
         new_seq.push_str(&seq[..del_range.start]);
@@ -58,7 +56,7 @@ pub fn generate_deletion<'a>(
     while let Some((_, _, rrange)) = seq_iter.next() {
         let del_seq = &seq[rrange.clone()];
         if mask_del {
-            new_seq.push_str(&"N".repeat(del_seq.len()));
+            new_seq.extend(std::iter::repeat_n('N', del_seq.len()));
         }
 
         removed_seqs.push(RemovedSequence {
@@ -67,12 +65,8 @@ pub fn generate_deletion<'a>(
             seq: del_seq,
         });
 
-        let remaining_seq = if let Some((_, _, next_rrange)) = seq_iter.peek() {
-            &seq[rrange.end..next_rrange.start]
-        } else {
-            &seq[rrange.end..seq.len()]
-        };
-
+        let remaining_seq =
+            seq_until_next_segment(seq, rrange.end, seq_iter.peek().map(|(_, _, r)| r));
         new_seq.push_str(remaining_seq);
     }
 
@@ -1,4 +1,4 @@
-use std::{fs::File, io::Write, ops::Range};
+use std::{io::Write, ops::Range};
 
 use eyre::bail;
 use iset::{IntervalMap, IntervalSet};
@@ -57,27 +57,47 @@ pub fn generate_random_seq_ranges(
         remaining_segments -= 1
     }
 
-    let Some(end) = positions.largest().map(|(p, _)| p.end) else {
+    if positions.is_empty() {
         bail!("No positions found.")
-    };
+    }
 
-    // let last_pos = positions.last().context("No positions found.")?;
+    // Positions never overlap, so the full map holds the same intervals as a 0..end query.
     Ok(Some(
         positions
-            .into_iter(0..end)
+            .into_iter(..)
             .map(move |(range, (start, stop))| (start, stop, range)),
     ))
 }
 
-pub fn write_misassembly<O, R, I>(
+/// Get the sequence from a position up to the start of the next segment.
+///
+/// # Arguments
+/// * `seq` - Sequence to slice.
+/// * `start` - Start position of the slice.
+/// * `next_segment` - The next segment, if any. Otherwise, slice to the end of `seq`.
+///
+/// # Returns
+/// The slice of `seq` from `start` to the start of the next segment.
+///
+pub fn seq_until_next_segment<'a>(
+    seq: &'a str,
+    start: usize,
+    next_segment: Option<&Range<usize>>,
+) -> &'a str {
+    let end = next_segment.map_or(seq.len(), |next| next.start);
+    &seq[start..end]
+}
+
+pub fn write_misassembly<O, B, R, I>(
     seq: Vec<u8>,
     regions: I,
     definition: Definition,
     output_fa: &mut Writer<O>,
-    output_bed: Option<&mut bed::Writer<File>>,
+    output_bed: Option<&mut bed::Writer<B>>,
 ) -> eyre::Result<()>
 where
     O: Write,
+    B: Write,
     R: TryInto<Builder<3>>,
     I: IntoIterator<Item = R>,
 {
@@ -103,7 +123,7 @@ mod test {
     use itertools::Itertools;
     use noodles::core::Position;
 
-    use super::generate_random_seq_ranges;
+    use super::{generate_random_seq_ranges, seq_until_next_segment};
 
     #[test]
     fn test_generate_random_seq_ranges() {
@@ -116,4 +136,11 @@ mod test {
 
         assert_eq!(segments, [(1, 10, 2..3), (1, 10, 3..9)])
     }
+
+    #[test]
+    fn test_seq_until_next_segment() {
+        let seq = "AAAGGCCCTT";
+        assert_eq!(seq_until_next_segment(seq, 2, Some(&(5..7))), "AGG");
+        assert_eq!(seq_until_next_segment(seq, 7, None), "CTT");
+    }
 }